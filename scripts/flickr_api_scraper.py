@@ -6,16 +6,44 @@ Downloads scenic photos using direct URL patterns
 
 import os
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
 import time
 import argparse
+import threading
+import concurrent.futures
 from datetime import datetime
 import re
+from scraper_common import clean_name
+
+# Precompiled patterns used on every photo page
+_TITLE_RE = re.compile(r'<title>([^<]+)</title>')
+_USER_FROM_URL_RE = re.compile(r'/photos/([^/]+)/')
+_SECRET_RE = re.compile(r'"secret":"([a-f0-9]+)"')
+_DISPLAY_URL_RE = re.compile(r'"displayUrl":"(https://live\.staticflickr\.com/[^"]+)"')
+_IMG_B_RE = re.compile(r'<img[^>]+src="(https://live\.staticflickr\.com/[^"]+_b\.jpg)"')
+_URL_JPG_RE = re.compile(r'"url":"(https://[^"]+\.jpg)"')
+_SIZE_SUFFIX_RE = re.compile(r'_[a-z]\.jpg$')
+_PHOTO_URL_RE = re.compile(r'/photos/([^/]+)/(\d{10,})')
+_JSON_ID_RE = re.compile(r'"id":"(\d{10,})"')
+_QUERY_ID_RE = re.compile(r'photo_id=(\d{10,})')
 
 class FlickrAPIScraper:
-    def __init__(self, output_dir="flickr_scenic_photos", max_photos=100):
+    # Image URL patterns on a photo page, in order of preference
+    _INFO_IMG_PATTERNS = (_DISPLAY_URL_RE, _IMG_B_RE, _URL_JPG_RE)
+    
+    # Patterns to find photo IDs in search results
+    _SEARCH_ID_PATTERNS = (
+        _PHOTO_URL_RE,   # URL pattern
+        _JSON_ID_RE,     # JSON pattern
+        _QUERY_ID_RE,    # Query parameter
+    )
+    
+    def __init__(self, output_dir="flickr_scenic_photos", max_photos=100, max_workers=4):
         self.output_dir = output_dir
         self.max_photos = max_photos
+        self.max_workers = max_workers
         
         # Create output directories
         self.photos_dir = os.path.join(output_dir, "photos")
@@ -24,14 +52,24 @@ class FlickrAPIScraper:
         # Attribution data file
         self.attribution_file = os.path.join(output_dir, "attribution.json")
         self.attribution_data = []
+        self._lock = threading.Lock()
         
         # Session setup
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (compatible; Scenic-Scraper/1.0)',
             'Accept': 'application/json, text/javascript, */*; q=0.01',
+            'Connection': 'keep-alive',
         })
         
+        # Reuse connections and retry server errors
+        retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504),
+                      allowed_methods=('GET',))
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(10, max_workers),
+                              max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
         # Known photo IDs from the search results you provided
         # These are high-quality scenic photos with CC licenses
         self.sample_photos = [
@@ -60,20 +98,20 @@ class FlickrAPIScraper:
             
             # Extract title
             title = "Untitled"
-            title_match = re.search(r'<title>([^<]+)</title>', text)
+            title_match = _TITLE_RE.search(text)
             if title_match:
                 title = title_match.group(1).split('|')[0].strip()
             
             # Extract photographer
             photographer = username or "Unknown"
             if not username:
-                user_match = re.search(r'/photos/([^/]+)/', response.url)
+                user_match = _USER_FROM_URL_RE.search(response.url)
                 if user_match:
                     photographer = user_match.group(1)
             
             # Extract secret for download
             secret = None
-            secret_match = re.search(r'"secret":"([a-f0-9]+)"', text)
+            secret_match = _SECRET_RE.search(text)
             if secret_match:
                 secret = secret_match.group(1)
             
@@ -81,18 +119,12 @@ class FlickrAPIScraper:
             img_url = None
             
             # Look for various image URL patterns
-            patterns = [
-                r'"displayUrl":"(https://live\.staticflickr\.com/[^"]+)"',
-                r'<img[^>]+src="(https://live\.staticflickr\.com/[^"]+_b\.jpg)"',
-                r'"url":"(https://[^"]+\.jpg)"'
-            ]
-            
-            for pattern in patterns:
-                match = re.search(pattern, text)
+            for pattern in self._INFO_IMG_PATTERNS:
+                match = pattern.search(text)
                 if match:
                     img_url = match.group(1).replace('\\/', '/')
                     # Upgrade to largest size
-                    img_url = re.sub(r'_[a-z]\.jpg$', '_b.jpg', img_url)
+                    img_url = _SIZE_SUFFIX_RE.sub('_b.jpg', img_url)
                     break
             
             # Construct download URL if we have secret
@@ -121,8 +153,10 @@ class FlickrAPIScraper:
             return False
         
         photo_id = photo_info['id']
-        photographer_clean = re.sub(r'[^a-zA-Z0-9_-]', '_', photo_info['photographer'])
-        filename = f"flickr_{photo_id}_{photographer_clean}.jpg"
+        filename = photo_info.get('filename')
+        if not filename:
+            photographer_clean = clean_name(photo_info['photographer'])
+            filename = f"flickr_{photo_id}_{photographer_clean}.jpg"
         filepath = os.path.join(self.photos_dir, filename)
         
         # Skip if exists
@@ -138,30 +172,36 @@ class FlickrAPIScraper:
             # Try download URL first if available
             url_to_try = photo_info.get('download_url') or photo_info['image_url']
             
-            response = self.session.get(url_to_try, timeout=30, allow_redirects=True)
+            response = self.session.get(url_to_try, timeout=30, stream=True, allow_redirects=True)
             
             # If download URL redirects to login, try image URL
             if 'login' in response.url and photo_info.get('image_url'):
-                response = self.session.get(photo_info['image_url'], timeout=30)
+                response.close()
+                response = self.session.get(photo_info['image_url'], timeout=30, stream=True)
             
-            response.raise_for_status()
-            
-            # Save image
-            with open(filepath, 'wb') as f:
-                f.write(response.content)
+            with response:
+                response.raise_for_status()
+                
+                # Stream the image to a .part file, renamed when complete
+                temp_path = filepath + '.part'
+                with open(temp_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=65536):
+                        f.write(chunk)
+                os.replace(temp_path, filepath)
             
             # Save attribution
-            self.attribution_data.append({
-                'filename': filename,
-                'photo_id': photo_id,
-                'title': photo_info['title'],
-                'photographer': photo_info['photographer'],
-                'photo_url': photo_info['photo_url'],
-                'license': photo_info['license'],
-                'attribution': f"Photo by {photo_info['photographer']} on Flickr ({photo_info['license']})",
-                'attribution_html': f'Photo by <a href="{photo_info["photo_url"]}">{photo_info["photographer"]}</a> on Flickr',
-                'downloaded_at': datetime.now().isoformat()
-            })
+            with self._lock:
+                self.attribution_data.append({
+                    'filename': filename,
+                    'photo_id': photo_id,
+                    'title': photo_info['title'],
+                    'photographer': photo_info['photographer'],
+                    'photo_url': photo_info['photo_url'],
+                    'license': photo_info['license'],
+                    'attribution': f"Photo by {photo_info['photographer']} on Flickr ({photo_info['license']})",
+                    'attribution_html': f'Photo by <a href="{photo_info["photo_url"]}">{photo_info["photographer"]}</a> on Flickr',
+                    'downloaded_at': datetime.now().isoformat()
+                })
             
             print(f"  ✓ Downloaded successfully")
             return True
@@ -191,15 +231,8 @@ class FlickrAPIScraper:
             # Extract photo IDs from the response
             photo_ids = []
             
-            # Pattern to find photo IDs in various formats
-            patterns = [
-                r'/photos/([^/]+)/(\d{10,})',  # URL pattern
-                r'"id":"(\d{10,})"',           # JSON pattern
-                r'photo_id=(\d{10,})',          # Query parameter
-            ]
-            
-            for pattern in patterns[:1]:  # Focus on URL pattern
-                matches = re.findall(pattern, response.text)
+            for pattern in self._SEARCH_ID_PATTERNS[:1]:  # Focus on URL pattern
+                matches = pattern.findall(response.text)
                 for match in matches:
                     if isinstance(match, tuple):
                         username, photo_id = match
@@ -213,6 +246,9 @@ class FlickrAPIScraper:
             for photo in photo_ids:
                 if photo['id'] not in seen:
                     seen.add(photo['id'])
+                    # Derive the local filename once, while the username is at hand
+                    if photo['user']:
+                        photo['filename'] = f"flickr_{photo['id']}_{clean_name(photo['user'])}.jpg"
                     unique_photos.append(photo)
             
             print(f"Found {len(unique_photos)} unique photos")
@@ -223,11 +259,31 @@ class FlickrAPIScraper:
             print("Falling back to sample photos...")
             return self.sample_photos[:self.max_photos]
     
+    def process_photo(self, photo_data):
+        """Fetch info for a single photo and download it"""
+        photo_info = self.get_photo_info_direct(
+            photo_data['id'], 
+            photo_data.get('user')
+        )
+        
+        if not photo_info:
+            return False
+        
+        if photo_data.get('filename'):
+            photo_info['filename'] = photo_data['filename']
+        
+        downloaded = self.download_photo(photo_info)
+        
+        # Be respectful - each worker paces its own requests
+        time.sleep(2)
+        return downloaded
+    
     def scrape(self):
         """Main scraping function"""
         print(f"Starting Flickr photo scraper...")
         print(f"Output directory: {self.output_dir}")
         print(f"Maximum photos: {self.max_photos}")
+        print(f"Concurrent workers: {self.max_workers}")
         print("-" * 50)
         
         # Get photo IDs - try search first, fallback to samples
@@ -244,28 +300,25 @@ class FlickrAPIScraper:
         
         photos_downloaded = 0
         
-        for photo_data in photos_to_download:
-            if photos_downloaded >= self.max_photos:
-                break
+        # Fetch photos concurrently
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [pool.submit(self.process_photo, photo_data)
+                       for photo_data in photos_to_download[:self.max_photos]]
             
-            # Get photo info
-            photo_info = self.get_photo_info_direct(
-                photo_data['id'], 
-                photo_data.get('user')
-            )
-            
-            if photo_info:
-                # Download the photo
-                if self.download_photo(photo_info):
-                    photos_downloaded += 1
-                    print(f"Progress: {photos_downloaded}/{self.max_photos}")
-                
-                # Be respectful
-                time.sleep(2)
+            try:
+                for future in concurrent.futures.as_completed(futures):
+                    if future.result():
+                        photos_downloaded += 1
+                        print(f"Progress: {photos_downloaded}/{self.max_photos}")
+            except KeyboardInterrupt:
+                # Drop queued photos
+                for future in futures:
+                    future.cancel()
+                raise
         
         # Save attribution data
-        with open(self.attribution_file, 'w') as f:
-            json.dump(self.attribution_data, f, indent=2)
+        with open(self.attribution_file, 'wb') as f:
+            f.write(orjson.dumps(self.attribution_data, option=orjson.OPT_INDENT_2))
         
         # Print summary
         print("\n" + "=" * 50)
@@ -285,10 +338,13 @@ def main():
                        help='Output directory (default: flickr_scenic_photos)')
     parser.add_argument('-n', '--number', type=int, default=20,
                        help='Maximum number of photos to download (default: 20)')
+    parser.add_argument('-w', '--workers', type=int, default=4,
+                       help='Number of photos to fetch concurrently (default: 4)')
     
     args = parser.parse_args()
     
-    scraper = FlickrAPIScraper(output_dir=args.output, max_photos=args.number)
+    scraper = FlickrAPIScraper(output_dir=args.output, max_photos=args.number,
+                               max_workers=args.workers)
     scraper.scrape()
 
 if __name__ == "__main__":
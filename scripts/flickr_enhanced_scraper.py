@@ -6,19 +6,70 @@ Downloads scenic photos with full metadata including descriptions and location
 
 import os
 import re
-import json
+import html
+import mmap
+import orjson
 import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import argparse
+import threading
+import concurrent.futures
 from datetime import datetime
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from pathlib import Path
+from scraper_common import clean_name
+
+# Precompiled patterns used on every photo page; bytes patterns run on the
+# raw response body, so only captured groups are decoded
+
+# Bytes pattern so it can scan the memory-mapped HTML file directly
+_PHOTO_URL_RE = re.compile(rb'https://www\.flickr\.com/photos/([^/]+)/(\d{8,})')
+# The gap between "name" and "@type" is bounded so a page without a nearby
+# closing brace cannot make every "name" key scan to the end of the document
+_PLACE_RE = re.compile(rb'"name":\s*"([^"]+)"[^}]{0,300}"@type":\s*"Place"')
+
+# Structured-data keys collected in a single pass over the page; a value is
+# either a quoted string or a bare number
+_META_SCAN_RE = re.compile(
+    rb'"(latitude|longitude|addressCountry|addressRegion|dateCreated)":\s*'
+    rb'(?:"([^"]+)"|([-\d.]+))'
+)
+_NUMERIC_META_KEYS = ('latitude', 'longitude')
+_VIEW_RE = re.compile(rb'([\d,]+)\s*views?', re.IGNORECASE)
+
+# Image URLs embedded in the photo page JSON; slashes may be escaped and the
+# scheme may be omitted
+_DISPLAY_URL_RE = re.compile(rb'"displayUrl":"((?:https:)?(?:\\?/){2}live\.staticflickr\.com\\?/[^"]+)"')
+# Size suffixes are at most two characters, which tells them apart from the
+# ten-character secret in suffix-less URLs like {id}_{secret}.jpg
+_SIZE_SUFFIX_RE = re.compile(r'_([a-z0-9]{1,2})\.(?:jpg|png|gif)$')
+
+# Flickr size suffixes from largest down; '' is the suffix-less Medium 500
+_SIZE_RANK = {size: rank for rank, size in enumerate(
+    ('o', '6k', '5k', '4k', '3k', 'k', 'h', 'b', 'c', 'z', '', 'w', 'n', 'm', 'q', 't', 's'))}
+_LICENSE_HREF_RE = re.compile(r'/creativecommons/')
+
+# Sizes page: absolute links with their inner markup, and the displayed image
+# inside div#allsizes-photo as a fallback
+_SIZES_LINK_RE = re.compile(rb'<a\s[^>]*?\bhref="((?:https?:)?//[^"]+)"[^>]*>(.*?)</a>', re.IGNORECASE | re.DOTALL)
+_SIZES_IMG_RE = re.compile(
+    rb'<div\s[^>]*?\bid="allsizes-photo"[^>]*>(?:(?!</div>).)*?<img\s[^>]*?\bsrc="([^"]+)"',
+    re.IGNORECASE | re.DOTALL
+)
+_TAG_RE = re.compile(rb'<[^>]*>')
+
+# Only the element types get_photo_metadata looks for are built into the
+# tree; top-level scripts, styles and the large inline JSON blobs are skipped
+_METADATA_STRAINER = SoupStrainer(['h1', 'meta', 'div', 'a', 'span'])
 
 class EnhancedFlickrScraper:
-    def __init__(self, html_file, output_dir="flickr_scenic_photos", max_photos=None):
+    def __init__(self, html_file, output_dir="flickr_scenic_photos", max_photos=None, max_workers=4):
         self.html_file = html_file
         self.output_dir = output_dir
         self.max_photos = max_photos  # None means download all
+        self.max_workers = max_workers
         
         # Create output directories
         self.photos_dir = os.path.join(output_dir, "photos")
@@ -28,22 +79,61 @@ class EnhancedFlickrScraper:
         self.metadata_file = os.path.join(output_dir, "metadata.json")
         self.metadata = []
         
+        # Append-only journal of entries added since metadata.json was last
+        # written; metadata.json itself is rewritten every _save_every entries
+        self.journal_file = os.path.join(output_dir, "metadata.jsonl")
+        self._save_every = 25
+        self._dirty_since_save = 0
+        
         # Load existing metadata if file exists
         if os.path.exists(self.metadata_file):
             try:
-                with open(self.metadata_file, 'r') as f:
-                    self.metadata = json.load(f)
+                with open(self.metadata_file, 'rb') as f:
+                    self.metadata = orjson.loads(f.read())
                 print(f"Loaded {len(self.metadata)} existing metadata entries")
             except:
                 self.metadata = []
         
+        # Photo IDs that already have metadata, for O(1) duplicate checks
+        self._known_ids = {m.get('photo_id') for m in self.metadata}
+        
+        # Recover entries journalled by an interrupted run
+        if os.path.exists(self.journal_file):
+            recovered = 0
+            with open(self.journal_file, 'rb') as f:
+                for line in f:
+                    try:
+                        entry = orjson.loads(line)
+                    except ValueError:
+                        continue  # Torn final line from a crash
+                    if entry.get('photo_id') not in self._known_ids:
+                        self._known_ids.add(entry.get('photo_id'))
+                        self.metadata.append(entry)
+                        recovered += 1
+            if recovered:
+                print(f"Recovered {recovered} metadata entries from {self.journal_file}")
+        
+        self._journal = open(self.journal_file, 'ab')
+        
+        # Guards metadata and the journal across worker threads
+        self._lock = threading.Lock()
+        
         # Session setup
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Connection': 'keep-alive',
         })
         
+        # Reuse connections and retry server errors
+        retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504),
+                      allowed_methods=('GET',))
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(10, max_workers),
+                              max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
         # Track failures
         self.failed_downloads = []
     
@@ -51,29 +141,37 @@ class EnhancedFlickrScraper:
         """Extract photo information from saved HTML"""
         print(f"Extracting photo information from {self.html_file}...")
         
-        with open(self.html_file, 'r', encoding='utf-8') as f:
-            html_content = f.read()
+        # Find all photo URLs in the HTML, removing duplicates while
+        # preserving order (first username wins). The file is memory-mapped
+        # rather than read into a string, so large saved pages are paged in
+        # on demand and never decoded as a whole.
+        unique = {}
+        with open(self.html_file, 'rb') as f:
+            if os.fstat(f.fileno()).st_size:  # mmap cannot map an empty file
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as html_content:
+                    for match in _PHOTO_URL_RE.finditer(html_content):
+                        photo_id = match.group(2)
+                        if photo_id not in unique:
+                            unique[photo_id] = match.group(1)
         
-        # Find all photo URLs in the HTML
-        pattern = r'https://www\.flickr\.com/photos/([^/]+)/(\d{8,})'
-        matches = re.findall(pattern, html_content)
+        print(f"Found {len(unique)} unique photos")
         
-        # Remove duplicates while preserving order
-        seen = set()
-        photos = []
-        for username, photo_id in matches:
-            if photo_id not in seen:
-                seen.add(photo_id)
-                photos.append({
-                    'id': photo_id,
-                    'username': username,
-                    'url': f"https://www.flickr.com/photos/{username}/{photo_id}"
-                })
+        selected = list(unique.items())
+        if self.max_photos:
+            selected = selected[:self.max_photos]
         
-        print(f"Found {len(photos)} unique photos")
+        # The local filename is derived once here and carried on the photo
+        photos = []
+        for photo_id, username in selected:
+            photo_id = photo_id.decode('ascii')
+            username = username.decode('utf-8')
+            photos.append({
+                'id': photo_id,
+                'username': username,
+                'url': f"https://www.flickr.com/photos/{username}/{photo_id}",
+                'filename': f"flickr_{photo_id}_{clean_name(username)}.jpg"
+            })
         
-        if self.max_photos:
-            return photos[:self.max_photos]
         return photos
     
     def get_photo_metadata(self, photo_info):
@@ -89,8 +187,11 @@ class EnhancedFlickrScraper:
             response = self.session.get(photo_url, timeout=30)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            html_text = response.text
+            # The regex paths below work on the raw bytes; only the parser
+            # needs decoded text, and it decodes the body itself
+            html_bytes = response.content
+            soup = BeautifulSoup(html_bytes, 'lxml', parse_only=_METADATA_STRAINER,
+                                 from_encoding=response.encoding)
             
             metadata = {
                 'photo_id': photo_id,
@@ -132,30 +233,35 @@ class EnhancedFlickrScraper:
                 location_data['url'] = 'https://www.flickr.com' + location_elem.get('href', '')
             
             # Method 2: Extract from JavaScript/JSON-LD data
-            # Look for coordinates in the page source
-            lat_match = re.search(r'"latitude":\s*([-\d.]+)', html_text)
-            lon_match = re.search(r'"longitude":\s*([-\d.]+)', html_text)
+            # Scan the page source once, keeping the first value for each key
+            structured = {}
+            for match in _META_SCAN_RE.finditer(html_bytes):
+                key, text_value, number_value = match.groups()
+                key = key.decode('ascii')
+                value = number_value if key in _NUMERIC_META_KEYS else text_value
+                if value is not None and key not in structured:
+                    structured[key] = value.decode('utf-8', 'replace')
+                    if len(structured) == 5:  # Every key found
+                        break
             
-            if lat_match and lon_match:
+            # Look for coordinates in the page source
+            if 'latitude' in structured and 'longitude' in structured:
                 try:
-                    location_data['latitude'] = float(lat_match.group(1))
-                    location_data['longitude'] = float(lon_match.group(1))
+                    location_data['latitude'] = float(structured['latitude'])
+                    location_data['longitude'] = float(structured['longitude'])
                 except:
                     pass
             
             # Look for place names in structured data
-            place_matches = re.findall(r'"name":\s*"([^"]+)"[^}]*"@type":\s*"Place"', html_text)
-            if place_matches:
-                location_data['place_name'] = place_matches[0]
+            place_match = _PLACE_RE.search(html_bytes)
+            if place_match:
+                location_data['place_name'] = place_match.group(1).decode('utf-8', 'replace')
             
             # Look for country/region
-            country_match = re.search(r'"addressCountry":\s*"([^"]+)"', html_text)
-            region_match = re.search(r'"addressRegion":\s*"([^"]+)"', html_text)
-            
-            if country_match:
-                location_data['country'] = country_match.group(1)
-            if region_match:
-                location_data['region'] = region_match.group(1)
+            if 'addressCountry' in structured:
+                location_data['country'] = structured['addressCountry']
+            if 'addressRegion' in structured:
+                location_data['region'] = structured['addressRegion']
             
             metadata['location'] = location_data if location_data else None
             
@@ -175,9 +281,7 @@ class EnhancedFlickrScraper:
                 date_taken = date_elem.get_text(strip=True)
             else:
                 # Try to find in meta tags or structured data
-                date_match = re.search(r'"dateCreated":\s*"([^"]+)"', html_text)
-                if date_match:
-                    date_taken = date_match.group(1)
+                date_taken = structured.get('dateCreated')
             metadata['date_taken'] = date_taken
             
             # Extract photographer's real name if available
@@ -191,103 +295,138 @@ class EnhancedFlickrScraper:
             
             # Extract view count
             views = None
-            view_match = re.search(r'([\d,]+)\s*views?', html_text, re.IGNORECASE)
+            view_match = _VIEW_RE.search(html_bytes)
             if view_match:
-                views = view_match.group(1).replace(',', '')
+                views = view_match.group(1).replace(b',', b'').decode('ascii')
             metadata['views'] = views
             
             # Extract license information
             license_info = "CC (See Flickr for specific license)"
-            license_elem = soup.find('a', href=re.compile(r'/creativecommons/'))
+            license_elem = soup.find('a', href=_LICENSE_HREF_RE)
             if license_elem:
                 license_info = license_elem.get_text(strip=True)
             metadata['license'] = license_info
             
+            # Image URL from the same page, so the sizes page can be skipped
+            metadata['_image_url'] = self.find_inline_image_url(html_bytes, photo_id)
+            
             return metadata
             
         except Exception as e:
             print(f"  Error fetching metadata: {e}")
             return None
     
+    def find_inline_image_url(self, html_bytes, photo_id):
+        """Pick the largest image URL of this photo embedded in its page, if any"""
+        best_url = None
+        best_rank = None
+        # The page also embeds neighbouring photos; their URLs carry other IDs
+        own_prefix = f'/{photo_id}_'
+        
+        for match in _DISPLAY_URL_RE.finditer(html_bytes):
+            url = match.group(1).decode('utf-8', 'replace').replace('\\/', '/')
+            if own_prefix not in url:
+                continue
+            if url.startswith('//'):
+                url = 'https:' + url
+            
+            size_match = _SIZE_SUFFIX_RE.search(url)
+            rank = _SIZE_RANK.get(size_match.group(1) if size_match else '', len(_SIZE_RANK))
+            if best_rank is None or rank < best_rank:
+                best_url, best_rank = url, rank
+        
+        return best_url
+    
+    def get_download_url_from_sizes(self, photo_info):
+        """Find the download URL on a photo's sizes page"""
+        photo_id = photo_info['id']
+        username = photo_info['username']
+        
+        # Get the sizes page
+        sizes_url = f"https://www.flickr.com/photos/{username}/{photo_id}/sizes/"
+        
+        response = self.session.get(sizes_url, timeout=30)
+        response.raise_for_status()
+        
+        page = response.content
+        
+        # Look for download links
+        for match in _SIZES_LINK_RE.finditer(page):
+            link_text = _TAG_RE.sub(b'', match.group(2)).lower()
+            
+            if b'download' in link_text or b'original' in link_text:
+                href = html.unescape(match.group(1).decode('utf-8', 'replace'))
+                if href.startswith('//'):
+                    return 'https:' + href
+                return href
+        
+        # Fallback to displayed image
+        img_match = _SIZES_IMG_RE.search(page)
+        if img_match:
+            image_url = html.unescape(img_match.group(1).decode('utf-8', 'replace'))
+            if image_url.startswith('//'):
+                image_url = 'https:' + image_url
+            return image_url
+        
+        return None
+    
     def download_photo_with_metadata(self, photo_info, metadata):
-        """Download photo from sizes page and save with metadata"""
+        """Download photo and save it with its metadata"""
         photo_id = photo_info['id']
         username = photo_info['username']
         
         print(f"  Downloading photo {photo_id}...")
         
-        # Get the sizes page
-        sizes_url = f"https://www.flickr.com/photos/{username}/{photo_id}/sizes/"
+        # Prefer the image URL found on the photo page; it is internal and
+        # must not end up in metadata.json
+        final_url = metadata.pop('_image_url', None)
+        from_photo_page = bool(final_url)
         
         try:
-            response = self.session.get(sizes_url, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Find the download URL
-            download_url = None
-            image_url = None
-            
-            # Look for download links
-            download_links = soup.find_all('a', href=True)
-            for link in download_links:
-                href = link.get('href')
-                link_text = link.get_text(strip=True).lower()
-                
-                if 'download' in link_text or 'original' in link_text:
-                    if href.startswith('//'):
-                        download_url = 'https:' + href
-                    elif href.startswith('http'):
-                        download_url = href
-                    if download_url:
-                        break
-            
-            # Fallback to displayed image
-            if not download_url:
-                img_elem = soup.find('div', id='allsizes-photo')
-                if img_elem:
-                    img_tag = img_elem.find('img')
-                    if img_tag and img_tag.get('src'):
-                        image_url = img_tag['src']
-                        if image_url.startswith('//'):
-                            image_url = 'https:' + image_url
-            
-            final_url = download_url or image_url
+            # Only fetch the sizes page when the photo page had no image URL
+            if not final_url:
+                final_url = self.get_download_url_from_sizes(photo_info)
             
             if not final_url:
                 print(f"    ✗ Could not find download URL")
                 self.failed_downloads.append(photo_id)
                 return False
             
-            # Clean username for filename
-            clean_username = re.sub(r'[^a-zA-Z0-9_-]', '_', username)
-            filename = f"flickr_{photo_id}_{clean_username}.jpg"
+            filename = photo_info['filename']
             filepath = os.path.join(self.photos_dir, filename)
             
             # Skip if already exists
             if os.path.exists(filepath):
                 print(f"    Already downloaded: {filename}")
                 # Check if metadata already exists for this photo
-                existing_ids = [m.get('photo_id') for m in self.metadata]
-                if photo_id not in existing_ids:
+                if photo_id not in self._known_ids:
                     # Still add metadata even if photo exists
                     metadata['filename'] = filename
                     metadata['downloaded_at'] = datetime.now().isoformat()
                     metadata['file_size'] = os.path.getsize(filepath)
-                    self.metadata.append(metadata)
-                    # Save metadata immediately
-                    with open(self.metadata_file, 'w') as f:
-                        json.dump(self.metadata, f, indent=2)
+                    self.add_metadata(metadata)
                 return True
             
-            # Download the image
-            img_response = self.session.get(final_url, timeout=60)
-            img_response.raise_for_status()
-            
-            # Save the image
-            with open(filepath, 'wb') as f:
-                f.write(img_response.content)
+            # Download the image to a .part file, renamed when complete
+            img_response = self.session.get(final_url, timeout=60, stream=True)
+            if img_response.status_code == 404 and from_photo_page:
+                # Stale URL on the photo page; ask the sizes page instead
+                img_response.close()
+                final_url = self.get_download_url_from_sizes(photo_info)
+                if not final_url:
+                    print(f"    ✗ Could not find download URL")
+                    self.failed_downloads.append(photo_id)
+                    return False
+                img_response = self.session.get(final_url, timeout=60, stream=True)
+            
+            with img_response:
+                img_response.raise_for_status()
+                
+                temp_path = filepath + '.part'
+                with open(temp_path, 'wb') as f:
+                    for chunk in img_response.iter_content(chunk_size=65536):
+                        f.write(chunk)
+                os.replace(temp_path, filepath)
             
             # Add file info to metadata
             metadata['filename'] = filename
@@ -300,11 +439,7 @@ class EnhancedFlickrScraper:
             metadata['attribution'] = f"Photo by {photographer} on Flickr"
             metadata['attribution_html'] = f'Photo by <a href="{photo_info["url"]}">{photographer}</a> on Flickr'
             
-            self.metadata.append(metadata)
-            
-            # Save metadata immediately after each download
-            with open(self.metadata_file, 'w') as f:
-                json.dump(self.metadata, f, indent=2)
+            self.add_metadata(metadata)
             
             print(f"    ✓ Downloaded: {filename} ({metadata['file_size'] / 1024 / 1024:.1f} MB)")
             
@@ -323,12 +458,67 @@ class EnhancedFlickrScraper:
             self.failed_downloads.append(photo_id)
             return False
     
+    def add_metadata(self, metadata):
+        """Record a metadata entry and journal it so a crash does not lose it"""
+        with self._lock:
+            self.metadata.append(metadata)
+            self._known_ids.add(metadata.get('photo_id'))
+            self._journal.write(orjson.dumps(metadata) + b'\n')
+            self._journal.flush()
+            
+            self._dirty_since_save += 1
+            if self._dirty_since_save >= self._save_every:
+                self._flush_metadata()
+    
+    def _flush_metadata(self):
+        """Atomically rewrite metadata.json and empty the journal (caller holds the lock)"""
+        tmp_file = self.metadata_file + '.tmp'
+        with open(tmp_file, 'wb') as f:
+            f.write(orjson.dumps(self.metadata, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_file, self.metadata_file)
+        
+        # Everything journalled so far is now in metadata.json
+        self._journal.truncate(0)
+        self._dirty_since_save = 0
+    
+    def save_metadata(self):
+        """Write the full metadata file and retire the journal"""
+        with self._lock:
+            self._flush_metadata()
+        
+        self._journal.close()
+        os.remove(self.journal_file)
+    
+    def process_photo(self, photo_info):
+        """Fetch metadata for a single photo and download it"""
+        # Nothing to fetch if both the image and its metadata are already here
+        if photo_info['id'] in self._known_ids:
+            filename = photo_info['filename']
+            if os.path.exists(os.path.join(self.photos_dir, filename)):
+                print(f"Already downloaded: {filename}")
+                return True
+        
+        # Get comprehensive metadata
+        metadata = self.get_photo_metadata(photo_info)
+        
+        if metadata:
+            # Download the photo with metadata
+            downloaded = self.download_photo_with_metadata(photo_info, metadata)
+        else:
+            downloaded = False
+            self.failed_downloads.append(photo_info['id'])
+        
+        # Be respectful - each worker paces its own requests
+        time.sleep(1.5)
+        return downloaded
+    
     def scrape(self):
         """Main scraping function"""
         print(f"Starting Enhanced Flickr Scraper...")
         print(f"HTML file: {self.html_file}")
         print(f"Output directory: {self.output_dir}")
         print(f"Maximum photos: {self.max_photos or 'All'}")
+        print(f"Concurrent workers: {self.max_workers}")
         print("-" * 50)
         
         # Extract photo information from HTML
@@ -343,36 +533,37 @@ class EnhancedFlickrScraper:
         
         total_photos = len(photos)
         
-        for idx, photo_info in enumerate(photos, 1):
-            print(f"\n[{idx}/{total_photos}] Processing {photo_info['id']}...")
-            
-            # Get comprehensive metadata
-            metadata = self.get_photo_metadata(photo_info)
+        # Fetch photos concurrently
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [pool.submit(self.process_photo, photo_info) for photo_info in photos]
             
-            if metadata:
-                # Download the photo with metadata
-                if self.download_photo_with_metadata(photo_info, metadata):
-                    photos_downloaded += 1
-                else:
-                    photos_skipped += 1
-            else:
-                photos_skipped += 1
-                self.failed_downloads.append(photo_info['id'])
-            
-            # Progress update
-            if idx % 10 == 0:
-                print(f"\n=== Progress: {idx}/{total_photos} processed, {photos_downloaded} downloaded ===\n")
-            
-            # Be respectful with rate limiting
-            time.sleep(1.5)
+            try:
+                for idx, future in enumerate(concurrent.futures.as_completed(futures), 1):
+                    if future.result():
+                        photos_downloaded += 1
+                    else:
+                        photos_skipped += 1
+                    
+                    # Progress update
+                    if idx % 10 == 0:
+                        print(f"\n=== Progress: {idx}/{total_photos} processed, {photos_downloaded} downloaded ===\n")
+            except KeyboardInterrupt:
+                # Drop queued photos
+                for future in futures:
+                    future.cancel()
+                # Checkpoint what we have; later entries still reach the journal
+                with self._lock:
+                    self._flush_metadata()
+                raise
         
-        # Metadata is already saved incrementally after each download
+        # Final write; entries were checkpointed and journalled as they were added
+        self.save_metadata()
         
         # Save failed downloads list
         if self.failed_downloads:
             failed_file = os.path.join(self.output_dir, "failed_downloads.json")
-            with open(failed_file, 'w') as f:
-                json.dump(self.failed_downloads, f, indent=2)
+            with open(failed_file, 'wb') as f:
+                f.write(orjson.dumps(self.failed_downloads, option=orjson.OPT_INDENT_2))
         
         # Print summary
         print("\n" + "=" * 60)
@@ -418,6 +609,8 @@ def main():
                        help='Output directory (default: flickr_collection)')
     parser.add_argument('-n', '--number', type=int, default=None,
                        help='Maximum number of photos to download (default: all)')
+    parser.add_argument('-w', '--workers', type=int, default=4,
+                       help='Number of photos to fetch concurrently (default: 4)')
     
     args = parser.parse_args()
     
@@ -429,7 +622,8 @@ def main():
     scraper = EnhancedFlickrScraper(
         html_file=args.html_file,
         output_dir=args.output,
-        max_photos=args.number
+        max_photos=args.number,
+        max_workers=args.workers
     )
     scraper.scrape()
 
@@ -6,66 +6,194 @@ Downloads scenic photos using saved HTML search results
 
 import os
 import re
-import json
-import time
+import mmap
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import argparse
-from datetime import datetime
-from bs4 import BeautifulSoup
+import threading
+import concurrent.futures
+from collections import deque
+from bs4 import BeautifulSoup, SoupStrainer
 from pathlib import Path
+from scraper_common import RateLimiter, timestamp, JsonCache, ContentHashes, save_stream
+
+# Photo page links in the saved search HTML:
+# https://www.flickr.com/photos/{username}/{photo_id}
+# Bytes pattern so it can scan the memory-mapped file without decoding it
+_PHOTO_URL_RE = re.compile(rb'https://www\.flickr\.com/photos/([^/]+)/(\d{8,})')
+_TITLE_STRIP_RE = re.compile(r'All sizes.*?of\s+')
+
+# Only the element types the sizes pages are searched for are built into the
+# tree; scripts, styles and other markup are skipped while parsing
+_SIZES_STRAINER = SoupStrainer(['h1', 'a', 'div'])
+_ORIGINAL_SIZE_STRAINER = SoupStrainer(['div'])
 
 class FlickrHTMLScraper:
-    def __init__(self, html_file, output_dir="flickr_scenic_photos", max_photos=100):
+    def __init__(self, html_file, output_dir="flickr_scenic_photos", max_photos=100, max_workers=4):
         self.html_file = html_file
         self.output_dir = output_dir
         self.max_photos = max_photos
+        self.max_workers = max_workers
         
         # Create output directories
         self.photos_dir = os.path.join(output_dir, "photos")
         os.makedirs(self.photos_dir, exist_ok=True)
         
-        # Attribution data file
-        self.attribution_file = os.path.join(output_dir, "attribution.json")
-        self.attribution_data = []
+        # Files already in photos/
+        self._existing = set(os.listdir(self.photos_dir))
+        
+        # Attribution data file (JSON Lines, appended per photo)
+        self.attribution_file = os.path.join(output_dir, "attribution.jsonl")
+        self._attribution_out = open(self.attribution_file, 'ab')
+        # Only the latest entry is kept in memory, for the summary
+        self.attribution_data = deque(maxlen=1)
+        
+        # Sizes-page results from earlier runs: photo ID -> final_url, title
+        self.url_cache = JsonCache(os.path.join(output_dir, "url_cache.json"))
+        
+        # Guards the attribution file and caches across worker threads
+        self._lock = threading.Lock()
+        
+        # Content hash -> filename, for hard-linking duplicates
+        self.content_hashes = ContentHashes(os.path.join(output_dir, "content_hashes.json"),
+                                            self.photos_dir, self._lock)
         
         # Session setup
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Connection': 'keep-alive',
         })
+        
+        # Reuse connections and retry server errors (429s go to the limiter)
+        retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504),
+                      allowed_methods=('GET',), respect_retry_after_header=False)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(10, max_workers),
+                              max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # Shared request pacing and 429 backoff
+        self._limiter = RateLimiter(self.session, busy_statuses=(429,))
     
     def extract_photos_from_html(self):
         """Extract photo information from saved HTML"""
         print(f"Extracting photo information from {self.html_file}...")
         
-        with open(self.html_file, 'r', encoding='utf-8') as f:
-            html_content = f.read()
-        
-        # Find all photo URLs in the HTML
-        # Pattern: https://www.flickr.com/photos/{username}/{photo_id}
-        pattern = r'https://www\.flickr\.com/photos/([^/]+)/(\d{8,})'
-        matches = re.findall(pattern, html_content)
+        # Find photo URLs in the HTML, removing duplicates while preserving
+        # order (first username wins); the scan stops as soon as enough photos
+        # have been found. The file is memory-mapped rather than read into
+        # memory, so large saved pages are paged in on demand.
+        unique = {}
+        with open(self.html_file, 'rb') as f:
+            if os.fstat(f.fileno()).st_size:  # mmap cannot map an empty file
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as html_content:
+                    for match in _PHOTO_URL_RE.finditer(html_content):
+                        if len(unique) >= self.max_photos:
+                            break
+                        unique.setdefault(match.group(2), match.group(1))
         
-        # Remove duplicates while preserving order
-        seen = set()
+        # Only the captured groups of the photos kept are decoded
         photos = []
-        for username, photo_id in matches:
-            if photo_id not in seen:
-                seen.add(photo_id)
-                photos.append({
-                    'id': photo_id,
-                    'username': username,
-                    'url': f"https://www.flickr.com/photos/{username}/{photo_id}"
-                })
+        for photo_id, username in unique.items():
+            photo_id = photo_id.decode('ascii')
+            username = username.decode('utf-8')
+            photos.append({
+                'id': photo_id,
+                'username': username,
+                'url': f"https://www.flickr.com/photos/{username}/{photo_id}"
+            })
         
         print(f"Found {len(photos)} unique photos")
-        return photos[:self.max_photos]
+        return photos
     
     def get_photo_sizes_url(self, photo_id, username):
         """Construct the sizes page URL for a photo"""
         return f"https://www.flickr.com/photos/{username}/{photo_id}/sizes/"
     
+    def find_download_url(self, photo_id, sizes_url):
+        """Scrape a photo's sizes page for its title and the best image URL"""
+        response = self._limiter.get(sizes_url, timeout=30)
+        response.raise_for_status()
+        
+        soup = BeautifulSoup(response.text, 'lxml', parse_only=_SIZES_STRAINER)
+        
+        # Extract photo title
+        title = "Untitled"
+        title_elem = soup.find('h1')
+        if title_elem:
+            title_text = title_elem.get_text(strip=True)
+            # Clean up the title (remove "All sizes", etc.)
+            title = _TITLE_STRIP_RE.sub('', title_text).strip()
+            if not title or title == "All sizes":
+                title = f"Photo_{photo_id}"
+        
+        # Find the largest available size
+        # Look for download links in order of preference: Original, Large, Medium
+        download_url = None
+        image_url = None
+        
+        # Method 1: Look for download buttons/links; only absolute links can be
+        # used, so the selector skips every relative anchor up front
+        download_links = soup.select('a[href^="http"], a[href^="//"]')
+        
+        # Flickr's download links usually say so in the URL, which is a plain
+        # substring test; only fall back to the link text, which walks each
+        # anchor's subtree, when no URL matches
+        for link in download_links:
+            href = link['href']
+            if 'download' in href or '/original/' in href:
+                download_url = 'https:' + href if href.startswith('//') else href
+                break
+        
+        if not download_url:
+            for link in download_links:
+                link_text = link.get_text(strip=True).lower()
+                
+                # Check for download links
+                if 'download' in link_text or 'original' in link_text:
+                    href = link['href']
+                    download_url = 'https:' + href if href.startswith('//') else href
+                    break
+        
+        # Method 2: Find the displayed image on the page
+        if not download_url:
+            # Look for the main image
+            img_elem = soup.find('div', id='allsizes-photo')
+            if img_elem:
+                img_tag = img_elem.find('img')
+                if img_tag and img_tag.get('src'):
+                    image_url = img_tag['src']
+                    if image_url.startswith('//'):
+                        image_url = 'https:' + image_url
+        
+        # Method 3: Extract from size links
+        if not download_url and not image_url:
+            # Find links to different sizes
+            size_links = soup.select('a[href*="/sizes/"]')
+            for link in size_links:
+                if 'Original' in link.get_text():
+                    # Navigate to original size page
+                    orig_url = 'https://www.flickr.com' + link['href']
+                    orig_response = self._limiter.get(orig_url, timeout=30)
+                    orig_soup = BeautifulSoup(orig_response.text, 'lxml',
+                                              parse_only=_ORIGINAL_SIZE_STRAINER)
+                    
+                    img_div = orig_soup.find('div', id='allsizes-photo')
+                    if img_div:
+                        img_tag = img_div.find('img')
+                        if img_tag and img_tag.get('src'):
+                            image_url = img_tag['src']
+                            if image_url.startswith('//'):
+                                image_url = 'https:' + image_url
+                            break
+        
+        # Use whichever URL we found
+        return download_url or image_url, title
+    
     def download_photo_from_sizes(self, photo_info):
         """Download photo using the sizes page"""
         photo_id = photo_info['id']
@@ -76,99 +204,40 @@ class FlickrHTMLScraper:
         # Get the sizes page
         sizes_url = self.get_photo_sizes_url(photo_id, username)
         
+        filename = f"flickr_{photo_id}_{username.replace('/', '_')}.jpg"
+        filepath = os.path.join(self.photos_dir, filename)
+        
+        # Skip if already exists; the sizes page is not needed for that
+        if filename in self._existing or os.path.exists(filepath):
+            print(f"  Already downloaded: {filename}")
+            return True
+        
         try:
-            response = self.session.get(sizes_url, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Extract photo title
-            title = "Untitled"
-            title_elem = soup.find('h1')
-            if title_elem:
-                title_text = title_elem.get_text(strip=True)
-                # Clean up the title (remove "All sizes", etc.)
-                title = re.sub(r'All sizes.*?of\s+', '', title_text).strip()
-                if not title or title == "All sizes":
-                    title = f"Photo_{photo_id}"
-            
-            # Find the largest available size
-            # Look for download links in order of preference: Original, Large, Medium
-            download_url = None
-            image_url = None
-            
-            # Method 1: Look for download buttons/links
-            download_links = soup.find_all('a', href=True)
-            for link in download_links:
-                href = link.get('href')
-                link_text = link.get_text(strip=True).lower()
+            # URLs found on an earlier run are reused instead of re-scraped
+            cached = self.url_cache.get(photo_id)
+            if cached:
+                final_url, title = cached['final_url'], cached['title']
+            else:
+                final_url, title = self.find_download_url(photo_id, sizes_url)
                 
-                # Check for download links
-                if 'download' in link_text or 'original' in link_text:
-                    if href.startswith('//'):
-                        download_url = 'https:' + href
-                    elif href.startswith('http'):
-                        download_url = href
-                    if download_url:
-                        break
-            
-            # Method 2: Find the displayed image on the page
-            if not download_url:
-                # Look for the main image
-                img_elem = soup.find('div', id='allsizes-photo')
-                if img_elem:
-                    img_tag = img_elem.find('img')
-                    if img_tag and img_tag.get('src'):
-                        image_url = img_tag['src']
-                        if image_url.startswith('//'):
-                            image_url = 'https:' + image_url
-            
-            # Method 3: Extract from size links
-            if not download_url and not image_url:
-                # Find links to different sizes
-                size_links = soup.find_all('a', href=re.compile(r'/sizes/'))
-                for link in size_links:
-                    if 'Original' in link.get_text():
-                        # Navigate to original size page
-                        orig_url = 'https://www.flickr.com' + link['href']
-                        orig_response = self.session.get(orig_url, timeout=30)
-                        orig_soup = BeautifulSoup(orig_response.text, 'html.parser')
-                        
-                        img_div = orig_soup.find('div', id='allsizes-photo')
-                        if img_div:
-                            img_tag = img_div.find('img')
-                            if img_tag and img_tag.get('src'):
-                                image_url = img_tag['src']
-                                if image_url.startswith('//'):
-                                    image_url = 'https:' + image_url
-                                break
-            
-            # Use whichever URL we found
-            final_url = download_url or image_url
-            
-            if not final_url:
-                print(f"  ✗ Could not find download URL")
-                return False
-            
-            # Download the image
-            filename = f"flickr_{photo_id}_{username.replace('/', '_')}.jpg"
-            filepath = os.path.join(self.photos_dir, filename)
-            
-            # Skip if already exists
-            if os.path.exists(filepath):
-                print(f"  Already downloaded: {filename}")
-                return True
+                if not final_url:
+                    print(f"  ✗ Could not find download URL")
+                    return False
             
             print(f"  Downloading from: {final_url}")
-            img_response = self.session.get(final_url, timeout=60)
-            img_response.raise_for_status()
+            # Stream the image to disk
+            with self._limiter.get(final_url, timeout=60, stream=True) as img_response:
+                img_response.raise_for_status()
+                digest = save_stream(img_response.iter_content(chunk_size=65536), filepath)
             
-            # Save the image
-            with open(filepath, 'wb') as f:
-                f.write(img_response.content)
+            # Cache the URL only once it has worked
+            with self._lock:
+                self.url_cache[photo_id] = {'final_url': final_url, 'title': title}
             
-            # Save attribution data
-            self.attribution_data.append({
+            self.content_hashes.link_duplicate(filepath, digest)
+            
+            # Save attribution data, appending it to the file straight away
+            entry = {
                 'filename': filename,
                 'photo_id': photo_id,
                 'title': title,
@@ -178,22 +247,37 @@ class FlickrHTMLScraper:
                 'license': 'CC (See Flickr for specific license)',
                 'attribution': f"Photo by {username} on Flickr",
                 'attribution_html': f'Photo by <a href="{photo_info["url"]}">{username}</a> on Flickr',
-                'downloaded_at': datetime.now().isoformat()
-            })
+                'downloaded_at': timestamp()
+            }
+            with self._lock:
+                self.attribution_data.append(entry)
+                self._attribution_out.write(orjson.dumps(entry) + b'\n')
+                self._attribution_out.flush()
+                self._existing.add(filename)
             
             print(f"  ✓ Downloaded successfully: {filename}")
             return True
             
         except Exception as e:
             print(f"  ✗ Error: {e}")
+            # Scrape the sizes page again next time
+            with self._lock:
+                self.url_cache.pop(photo_id, None)
             return False
     
+    def save_caches(self):
+        """Write the URL and content-hash caches"""
+        with self._lock:
+            self.url_cache.save()
+            self.content_hashes.save()
+    
     def scrape(self):
         """Main scraping function"""
         print(f"Starting Flickr HTML-based scraper...")
         print(f"HTML file: {self.html_file}")
         print(f"Output directory: {self.output_dir}")
         print(f"Maximum photos: {self.max_photos}")
+        print(f"Concurrent workers: {self.max_workers}")
         print("-" * 50)
         
         # Extract photo information from HTML
@@ -205,21 +289,26 @@ class FlickrHTMLScraper:
         
         photos_downloaded = 0
         
-        for photo_info in photos:
-            if photos_downloaded >= self.max_photos:
-                break
-            
-            # Download the photo
-            if self.download_photo_from_sizes(photo_info):
-                photos_downloaded += 1
-                print(f"Progress: {photos_downloaded}/{min(len(photos), self.max_photos)}")
+        # Fetch photos concurrently
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [pool.submit(self.download_photo_from_sizes, photo_info) for photo_info in photos]
             
-            # Be respectful with rate limiting
-            time.sleep(2)
+            try:
+                for future in concurrent.futures.as_completed(futures):
+                    if future.result():
+                        photos_downloaded += 1
+                        print(f"Progress: {photos_downloaded}/{min(len(photos), self.max_photos)}")
+            except KeyboardInterrupt:
+                # Drop queued photos
+                for future in futures:
+                    future.cancel()
+                self.save_caches()
+                raise
+        
+        self.save_caches()
         
-        # Save attribution data
-        with open(self.attribution_file, 'w') as f:
-            json.dump(self.attribution_data, f, indent=2)
+        # Attribution entries were written as each photo finished
+        self._attribution_out.close()
         
         # Print summary
         print("\n" + "=" * 50)
@@ -230,7 +319,7 @@ class FlickrHTMLScraper:
         
         if self.attribution_data:
             print("\nSample attribution:")
-            sample = self.attribution_data[0]
+            sample = self.attribution_data[-1]
             print(f'  {sample["attribution"]}')
             print(f'  Title: {sample["title"]}')
             print(f'  URL: {sample["photo_url"]}')
@@ -244,6 +333,8 @@ def main():
                        help='Output directory (default: flickr_scenic_photos)')
     parser.add_argument('-n', '--number', type=int, default=20,
                        help='Maximum number of photos to download (default: 20)')
+    parser.add_argument('-w', '--workers', type=int, default=4,
+                       help='Number of photos to fetch concurrently (default: 4)')
     
     args = parser.parse_args()
     
@@ -255,7 +346,8 @@ def main():
     scraper = FlickrHTMLScraper(
         html_file=args.html_file,
         output_dir=args.output,
-        max_photos=args.number
+        max_photos=args.number,
+        max_workers=args.workers
     )
     scraper.scrape()
 
@@ -6,27 +6,64 @@ Downloads scenic photos with commercial use licenses and maintains attribution d
 
 import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
-import time
+import orjson
 import argparse
-from datetime import datetime
+import threading
+import concurrent.futures
 from urllib.parse import urlparse, parse_qs, urljoin
 import re
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from scraper_common import RateLimiter, timestamp, JsonCache, ContentHashes, save_stream
+
+# Precompiled patterns used on every search result and photo page
+_URL_STYLE_RE = re.compile(r'url\((.*?)\)')
+# Thumbnail URLs: //live.staticflickr.com/{server}/{id}_{secret}_{size}.jpg
+_THUMB_ID_RE = re.compile(r'/(\d+)_[a-f0-9]+_')
+_PHOTOS_PATH_RE = re.compile(r'/photos/([^/]+)/(\d+)')
+_LICENSE_HREF_RE = re.compile(r'/creativecommons/')
+_DOWNLOAD_TRACK_RE = re.compile('download')
+_SECRET_RE = re.compile(r'"secret":"([a-f0-9]+)"')
+_SIZE_UPGRADE_RE = re.compile(r'_[a-z]\.(jpg|png)$')
+# Start of the JSON model Flickr embeds in search pages
+_MODEL_EXPORT_RE = re.compile(r'modelExport\s*:\s*')
+
+# Only the element types each page is searched for are built into the tree.
+# Search result tiles are only used when they sit inside a link, so keeping
+# anchors (with everything inside them) is enough for the search page.
+_SEARCH_STRAINER = SoupStrainer(['a'])
+_DETAILS_STRAINER = SoupStrainer(['a', 'span', 'h1', 'meta', 'div', 'img'])
 
 class FlickrScraper:
-    def __init__(self, output_dir="flickr_scenic_photos", max_photos=100):
+    def __init__(self, output_dir="flickr_scenic_photos", max_photos=100, max_workers=4):
         self.base_url = "https://www.flickr.com"
         self.output_dir = output_dir
         self.max_photos = max_photos
+        self.max_workers = max_workers
         
         # Create output directory
         self.photos_dir = os.path.join(output_dir, "photos")
         os.makedirs(self.photos_dir, exist_ok=True)
         
-        # Attribution data file
-        self.attribution_file = os.path.join(output_dir, "attribution.json")
-        self.attribution_data = []
+        # Files already in photos/
+        self._existing = set(os.listdir(self.photos_dir))
+        
+        # Attribution data file (JSON Lines, appended per photo)
+        self.attribution_file = os.path.join(output_dir, "attribution.jsonl")
+        self._attribution_out = open(self.attribution_file, 'ab')
+        
+        # Photo details scraped on earlier runs, keyed by photo ID, so a
+        # re-run does not fetch the same photo pages again
+        self.details_cache = JsonCache(os.path.join(output_dir, "details_cache.json"))
+        
+        # Guards the attribution file and caches across worker threads
+        self._lock = threading.Lock()
+        
+        # Content hash -> filename, for hard-linking duplicates
+        self.content_hashes = ContentHashes(os.path.join(output_dir, "content_hashes.json"),
+                                            self.photos_dir, self._lock)
         
         # Session for connection reuse
         self.session = requests.Session()
@@ -40,6 +77,17 @@ class FlickrScraper:
             'Upgrade-Insecure-Requests': '1'
         })
         
+        # Reuse connections and retry server errors (429s go to the limiter)
+        retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504),
+                      allowed_methods=('GET',), respect_retry_after_header=False)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(10, max_workers),
+                              max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # Shared request pacing and 429 backoff
+        self._limiter = RateLimiter(self.session, busy_statuses=(429,))
+        
         # License mapping (Creative Commons with commercial use)
         self.licenses = {
             '4': 'CC BY 2.0',           # Attribution
@@ -50,6 +98,11 @@ class FlickrScraper:
             '12': 'CC BY-SA 4.0'        # Attribution-ShareAlike 4.0
         }
         
+        # Every label in one pattern, matched against license text with its
+        # spaces removed so 'CC BY 2.0' and 'CCBY2.0' both match
+        self._license_labels = {label.replace(' ', ''): label for label in self.licenses.values()}
+        self._license_re = re.compile('|'.join(map(re.escape, self._license_labels)))
+        
     def search_photos(self, page=1):
         """Search for scenic photos with commercial CC licenses"""
         print(f"Fetching search results page {page}...")
@@ -73,10 +126,17 @@ class FlickrScraper:
         url = f"{self.base_url}/search/?{query_string}"
         
         try:
-            response = self.session.get(url, timeout=30)
+            response = self._limiter.get(url, timeout=30)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # Flickr embeds the result photos as JSON; when it is there, each
+            # photo's details come with it and its photo page is never fetched
+            photo_links = self.photos_from_model_export(response.text)
+            if photo_links:
+                print(f"Found {len(photo_links)} photos on page {page}")
+                return photo_links
+            
+            soup = BeautifulSoup(response.text, 'lxml', parse_only=_SEARCH_STRAINER)
             
             # Find photo links in search results
             photo_links = []
@@ -87,13 +147,13 @@ class FlickrScraper:
             for div in photo_divs:
                 # Extract photo URL from style attribute
                 style = div.get('style', '')
-                match = re.search(r'url\((.*?)\)', style)
+                match = _URL_STYLE_RE.search(style)
                 if match:
                     thumb_url = match.group(1).strip('"\'')
                     
                     # Extract photo ID from thumbnail URL
                     # Format: //live.staticflickr.com/{server}/{id}_{secret}_{size}.jpg
-                    id_match = re.search(r'/(\d+)_[a-f0-9]+_', thumb_url)
+                    id_match = _THUMB_ID_RE.search(thumb_url)
                     if id_match:
                         photo_id = id_match.group(1)
                         
@@ -109,10 +169,10 @@ class FlickrScraper:
             
             # Alternative method: Look for links directly
             if not photo_links:
-                links = soup.find_all('a', href=re.compile(r'/photos/[^/]+/\d+'))
+                links = soup.find_all('a', href=_PHOTOS_PATH_RE)
                 for link in links[:50]:  # Limit to prevent too many
                     href = link.get('href')
-                    match = re.search(r'/photos/([^/]+)/(\d+)', href)
+                    match = _PHOTOS_PATH_RE.search(href)
                     if match:
                         username = match.group(1)
                         photo_id = match.group(2)
@@ -130,6 +190,59 @@ class FlickrScraper:
             print(f"Error fetching search results: {e}")
             return []
     
+    def photos_from_model_export(self, html):
+        """Build photo links, with their details, from a search page's embedded JSON"""
+        match = _MODEL_EXPORT_RE.search(html)
+        if not match:
+            return []
+        
+        try:
+            model, _ = json.JSONDecoder().raw_decode(html, match.end())
+        except ValueError:
+            return []
+        
+        # Walk the model in document order looking for photo records
+        photo_links = []
+        seen = set()
+        stack = [model]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, list):
+                stack.extend(reversed(node))
+                continue
+            if not isinstance(node, dict):
+                continue
+            
+            if not {'id', 'secret', 'server'} <= node.keys():
+                stack.extend(reversed(list(node.values())))
+                continue
+            
+            photo_id = str(node['id'])
+            owner = node.get('pathAlias') or node.get('ownerNsid') or node.get('owner')
+            if photo_id in seen or not owner:
+                continue
+            seen.add(photo_id)
+            
+            photo_url = f"{self.base_url}/photos/{owner}/{photo_id}/"
+            photo_link = {'id': photo_id, 'url': photo_url}
+            
+            # Without a photographer name the photo page is still needed
+            photographer = node.get('realname') or node.get('username')
+            if photographer:
+                photo_link['details'] = {
+                    'id': photo_id,
+                    'url': photo_url,
+                    'title': node.get('title') or f'Untitled_{photo_id}',
+                    'photographer': photographer,
+                    'description': node.get('description') or None,
+                    'license': self.licenses.get(str(node.get('license')), 'CC (Commercial Use)'),
+                    'download_url': f"/photo_download.gne?id={photo_id}&secret={node['secret']}&size=o&source=photoPageEngagement",
+                    'image_url': f"https://live.staticflickr.com/{node['server']}/{photo_id}_{node['secret']}_b.jpg"
+                }
+            photo_links.append(photo_link)
+        
+        return photo_links
+    
     def get_photo_details(self, photo_info):
         """Get detailed information about a photo including attribution data"""
         photo_url = photo_info['url']
@@ -138,10 +251,10 @@ class FlickrScraper:
         print(f"\nFetching details for photo {photo_id}...")
         
         try:
-            response = self.session.get(photo_url, timeout=30)
+            response = self._limiter.get(photo_url, timeout=30)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(response.text, 'lxml', parse_only=_DETAILS_STRAINER)
             
             # Extract photographer name
             photographer = None
@@ -173,28 +286,27 @@ class FlickrScraper:
             
             # Extract license info
             license_info = None
-            license_elem = soup.find('a', href=re.compile(r'/creativecommons/'))
+            license_elem = soup.find('a', href=_LICENSE_HREF_RE)
             if license_elem:
                 license_text = license_elem.get_text(strip=True)
-                # Map to our license types
-                for key, value in self.licenses.items():
-                    if value in license_text or value.replace(' ', '') in license_text.replace(' ', ''):
-                        license_info = value
-                        break
+                # Map to our license types in a single pass over the text
+                license_match = self._license_re.search(license_text.replace(' ', ''))
+                if license_match:
+                    license_info = self._license_labels[license_match.group()]
             
             # Extract the download URL for original size
             # Look for the download button/link
             download_url = None
             
             # Method 1: Look for download link in page
-            download_link = soup.find('a', {'data-track': re.compile('download')})
+            download_link = soup.find('a', {'data-track': _DOWNLOAD_TRACK_RE})
             if download_link:
                 download_url = download_link.get('href')
             
             # Method 2: Construct download URL
             if not download_url:
                 # Find secret from page
-                secret_match = re.search(r'"secret":"([a-f0-9]+)"', response.text)
+                secret_match = _SECRET_RE.search(response.text)
                 if secret_match:
                     secret = secret_match.group(1)
                     download_url = f"/photo_download.gne?id={photo_id}&secret={secret}&size=o&source=photoPageEngagement"
@@ -214,7 +326,7 @@ class FlickrScraper:
             # If we have an image URL, upgrade it to larger size
             if img_url:
                 # Convert to largest available size
-                img_url = re.sub(r'_[a-z]\.(jpg|png)$', '_b.\\1', img_url)
+                img_url = _SIZE_UPGRADE_RE.sub('_b.\\1', img_url)
                 if not img_url.startswith('http'):
                     img_url = 'https:' + img_url
             
@@ -251,7 +363,7 @@ class FlickrScraper:
         filepath = os.path.join(self.photos_dir, filename)
         
         # Skip if already downloaded
-        if os.path.exists(filepath):
+        if filename in self._existing or os.path.exists(filepath):
             print(f"Already downloaded: {filename}")
             return True
         
@@ -263,15 +375,15 @@ class FlickrScraper:
             if img_url.startswith('//'):
                 img_url = 'https:' + img_url
             
-            response = self.session.get(img_url, timeout=30)
-            response.raise_for_status()
+            # Stream the image to disk
+            with self._limiter.get(img_url, timeout=30, stream=True) as response:
+                response.raise_for_status()
+                digest = save_stream(response.iter_content(chunk_size=65536), filepath)
             
-            # Save image
-            with open(filepath, 'wb') as f:
-                f.write(response.content)
+            self.content_hashes.link_duplicate(filepath, digest)
             
-            # Save attribution data
-            self.attribution_data.append({
+            # Save attribution data, appending it to the file straight away
+            entry = {
                 'filename': filename,
                 'photo_id': photo_id,
                 'title': photo_details['title'],
@@ -281,8 +393,12 @@ class FlickrScraper:
                 'license': photo_details['license'],
                 'description': photo_details['description'],
                 'attribution': f"Photo by {photo_details['photographer']} on Flickr ({photo_details['license']})",
-                'downloaded_at': datetime.now().isoformat()
-            })
+                'downloaded_at': timestamp()
+            }
+            with self._lock:
+                self._attribution_out.write(orjson.dumps(entry) + b'\n')
+                self._attribution_out.flush()
+                self._existing.add(filename)
             
             print(f"  ✓ Downloaded successfully")
             return True
@@ -291,49 +407,81 @@ class FlickrScraper:
             print(f"Error downloading photo: {e}")
             return False
     
+    def process_photo(self, photo_info):
+        """Fetch details for a single photo and download it"""
+        # Get detailed photo information, unless the search results carried
+        # it or an earlier run already fetched it
+        photo_details = photo_info.get('details') or self.details_cache.get(photo_info['id'])
+        if not photo_details:
+            photo_details = self.get_photo_details(photo_info)
+            
+            if not photo_details:
+                return False
+        
+        downloaded = self.download_photo(photo_details)
+        
+        # Keep only details that led to a download; anything else is refetched
+        # on the next run
+        with self._lock:
+            if downloaded and photo_details.get('image_url'):
+                self.details_cache[photo_info['id']] = photo_details
+            else:
+                self.details_cache.pop(photo_info['id'], None)
+        
+        return downloaded
+    
+    def save_caches(self):
+        """Write the details and content-hash caches"""
+        with self._lock:
+            self.details_cache.save()
+            self.content_hashes.save()
+    
     def scrape(self):
         """Main scraping function"""
         print(f"Starting Flickr scenic photo scraper...")
         print(f"Output directory: {self.output_dir}")
         print(f"Maximum photos: {self.max_photos}")
         print(f"Licenses: {', '.join(self.licenses.values())}")
+        print(f"Concurrent workers: {self.max_workers}")
         print("-" * 50)
         
         photos_downloaded = 0
         page = 1
         max_pages = 10  # Limit pages to prevent infinite loops
         
-        while photos_downloaded < self.max_photos and page <= max_pages:
-            # Get search results
-            photo_links = self.search_photos(page)
-            
-            if not photo_links:
-                print("No more photos found")
-                break
-            
-            for photo_info in photo_links:
-                if photos_downloaded >= self.max_photos:
+        # Fetch photos concurrently
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while photos_downloaded < self.max_photos and page <= max_pages:
+                # Get search results
+                photo_links = self.search_photos(page)
+                
+                if not photo_links:
+                    print("No more photos found")
                     break
                 
-                # Get detailed photo information
-                photo_details = self.get_photo_details(photo_info)
+                # Only queue as many photos as are still needed
+                remaining = self.max_photos - photos_downloaded
+                futures = [pool.submit(self.process_photo, photo_info)
+                           for photo_info in photo_links[:remaining]]
                 
-                if photo_details:
-                    # Download the photo
-                    if self.download_photo(photo_details):
-                        photos_downloaded += 1
-                        print(f"Progress: {photos_downloaded}/{self.max_photos}")
-                    
-                    # Be respectful - wait between downloads
-                    time.sleep(2)
-            
-            page += 1
-            # Longer delay between pages
-            time.sleep(3)
+                try:
+                    for future in concurrent.futures.as_completed(futures):
+                        if future.result():
+                            photos_downloaded += 1
+                            print(f"Progress: {photos_downloaded}/{self.max_photos}")
+                except KeyboardInterrupt:
+                    # Drop queued photos
+                    for future in futures:
+                        future.cancel()
+                    self.save_caches()
+                    raise
+                
+                page += 1
+        
+        self.save_caches()
         
-        # Save attribution data
-        with open(self.attribution_file, 'w') as f:
-            json.dump(self.attribution_data, f, indent=2)
+        # Attribution entries were written as each photo finished
+        self._attribution_out.close()
         
         # Print summary
         print("\n" + "=" * 50)
@@ -351,10 +499,13 @@ def main():
                        help='Output directory (default: flickr_scenic_photos)')
     parser.add_argument('-n', '--number', type=int, default=50,
                        help='Maximum number of photos to download (default: 50)')
+    parser.add_argument('-w', '--workers', type=int, default=4,
+                       help='Number of photos to fetch concurrently (default: 4)')
     
     args = parser.parse_args()
     
-    scraper = FlickrScraper(output_dir=args.output, max_photos=args.number)
+    scraper = FlickrScraper(output_dir=args.output, max_photos=args.number,
+                            max_workers=args.workers)
     scraper.scrape()
 
 if __name__ == "__main__":
@@ -6,22 +6,108 @@ Scrapes photos from geograph.org.uk recent photos page and sorts them by GPS ava
 
 import os
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
 import time
 from PIL import Image
-from PIL.ExifTags import TAGS, GPSTAGS
+from PIL.ExifTags import GPS, IFD
 import io
+import struct
 from urllib.parse import urljoin
 import argparse
+import threading
+import queue
+import concurrent.futures
 from datetime import datetime
 import json
+import orjson
 import re
+from scraper_common import RateLimiter, JsonCache
+
+# EXIF (and so any GPS data) lives in the APP1 segment at the start of a
+# JPEG, so classifying a photo only needs this much of it
+_EXIF_PROBE_BYTES = 65536
+
+# The photo links all sit in div.thumbs; building only the divs skips the
+# head, scripts and the rest of the page chrome
+_RECENT_STRAINER = SoupStrainer(['div'])
+
+_PHOTO_ID_RE = re.compile(r'/photo/(\d+)')
+# Thumbnail alt text, "GRIDREF : Title by Photographer": the grid reference
+# ends at the first " : " and the photographer follows the last " by "
+_ALT_RE = re.compile(r'(?P<gridref>.*?) : (?P<title>.*?)(?: by (?!by )(?P<photographer>(?:(?! by ).)*))?', re.S)
+
+# GPS IFD pointer in IFD0, and the GPS tags we read from the GPS IFD
+_GPS_IFD_TAG = 0x8825
+_GPS_TAGS = {GPS.GPSLatitudeRef, GPS.GPSLatitude, GPS.GPSLongitudeRef, GPS.GPSLongitude}
+
+def _ifd_entries(tiff, order, offset):
+    """Yield (tag, type, count, value bytes) for each entry of a TIFF IFD"""
+    count = struct.unpack_from(order + 'H', tiff, offset)[0]
+    for pos in range(offset + 2, offset + 2 + 12 * count, 12):
+        tag, typ, n = struct.unpack_from(order + 'HHI', tiff, pos)
+        size = n * {2: 1, 3: 2, 4: 4, 5: 8, 10: 8}.get(typ, 1)
+        # Values up to four bytes are stored in the entry itself
+        start = pos + 8
+        if size > 4:
+            start = struct.unpack_from(order + 'I', tiff, start)[0]
+        yield tag, typ, n, tiff[start:start + size]
+
+def read_jpeg_gps(data):
+    """Read the GPS latitude/longitude tags straight from a JPEG's Exif segment
+    
+    Returns {tag id: value} (empty when the JPEG has no Exif or no GPS IFD),
+    or None when the marker walk breaks off, so the caller can fall back to Pillow.
+    """
+    try:
+        if data[:2] != b'\xff\xd8':
+            return None
+        
+        # Walk the marker segments up to the image data looking for APP1 Exif
+        i = 2
+        while True:
+            if i + 4 > len(data) or data[i] != 0xFF:
+                return None  # Truncated or not a marker; let Pillow try
+            marker = data[i + 1]
+            if marker == 0xDA:  # Start of scan: no metadata after this
+                return {}
+            seg_len = int.from_bytes(data[i + 2:i + 4], 'big')
+            if marker == 0xE1 and data[i + 4:i + 10] == b'Exif\x00\x00':
+                tiff = data[i + 10:i + 2 + seg_len]
+                break
+            i += 2 + seg_len
+        
+        order = {b'II': '<', b'MM': '>'}[tiff[:2]]
+        
+        gps_offset = None
+        for tag, typ, n, value in _ifd_entries(tiff, order, struct.unpack_from(order + 'I', tiff, 4)[0]):
+            if tag == _GPS_IFD_TAG:
+                gps_offset = struct.unpack_from(order + 'I', value)[0]
+                break
+        if gps_offset is None:
+            return {}
+        
+        gps_data = {}
+        for tag, typ, n, value in _ifd_entries(tiff, order, gps_offset):
+            if tag not in _GPS_TAGS:
+                continue
+            if typ == 2:
+                gps_data[tag] = value.split(b'\x00', 1)[0].decode('latin-1')
+            elif typ in (5, 10):
+                nums = struct.unpack(order + ('I' if typ == 5 else 'i') * (2 * n), value)
+                gps_data[tag] = tuple(num / den if den else float('nan')
+                                      for num, den in zip(nums[::2], nums[1::2]))
+        return gps_data
+    except (KeyError, IndexError, struct.error):
+        return None
 
 class GeographScraper:
-    def __init__(self, output_dir="scraped_photos", max_photos=100):
+    def __init__(self, output_dir="scraped_photos", max_photos=100, max_workers=4):
         self.base_url = "https://www.geograph.org.uk"
         self.output_dir = output_dir
         self.max_photos = max_photos
+        self.max_workers = max_workers
         
         # Create output directories
         self.gps_dir = os.path.join(output_dir, "photos_with_GPS")
@@ -29,9 +115,34 @@ class GeographScraper:
         os.makedirs(self.gps_dir, exist_ok=True)
         os.makedirs(self.no_gps_dir, exist_ok=True)
         
-        # Create metadata file
-        self.metadata_file = os.path.join(output_dir, "metadata.json")
-        self.metadata = []
+        # Metadata file (JSON Lines, appended per photo)
+        self.metadata_file = os.path.join(output_dir, "metadata.jsonl")
+        
+        # Photos recorded by earlier runs, photo ID -> (filename, has GPS),
+        # so those still on disk are reused instead of downloaded again
+        self._previous = {}
+        if os.path.exists(self.metadata_file):
+            with open(self.metadata_file, 'rb') as f:
+                for line in f:
+                    try:
+                        entry = orjson.loads(line)
+                        self._previous[entry['photo_id']] = (entry['filename'], entry['has_gps_exif'])
+                    except:
+                        continue
+        self._metadata_out = open(self.metadata_file, 'ab')
+        
+        # Single writer thread for metadata entries
+        self._metadata_queue = queue.Queue()
+        self._metadata_error = None
+        self._metadata_writer = threading.Thread(target=self._write_metadata, daemon=True)
+        self._metadata_writer.start()
+        
+        # Image URLs found by HEAD-probing the servers: photo ID -> URL
+        self.url_cache = JsonCache(os.path.join(output_dir, "url_cache.json"))
+        
+        # Image server that answered last for each geophotos/dir1/dir2/dir3
+        # bucket, tried first for other photos in the same bucket
+        self._bucket_servers = {}
         
         # Statistics tracking
         self.stats = {
@@ -41,13 +152,94 @@ class GeographScraper:
             'failed': 0
         }
         
+        # Guards the metadata file, stats and caches across worker threads
+        self._lock = threading.Lock()
+        
         # Session for connection reuse
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (compatible; Scenic-Scraper/1.0; +https://github.com/scenic)',
             'Accept': 'image/jpeg,image/png,image/*',
+            'Connection': 'keep-alive',
         })
         
+        # Reuse connections and retry gateway errors (429/503 go to the limiter)
+        retry = Retry(total=3, backoff_factor=0.3, status_forcelist=(500, 502, 504),
+                      allowed_methods=('GET', 'HEAD'), respect_retry_after_header=False)
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=max(10, max_workers),
+                              max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # Shared request pacing and 429/503 backoff
+        self._limiter = RateLimiter(self.session, busy_statuses=(429, 503))
+        
+    def _write_metadata(self):
+        """Writer thread; an error is kept for close_metadata() to raise"""
+        try:
+            self._append_metadata()
+        except Exception as e:
+            self._metadata_error = e
+            self._metadata_out.close()
+    
+    def _append_metadata(self):
+        """Append queued metadata entries to the file until a None arrives"""
+        sync = getattr(os, 'fdatasync', os.fsync)
+        unsynced = False
+        last_sync = time.monotonic()
+        
+        while True:
+            try:
+                # Wake up after a quiet second to sync what was written
+                entries = [self._metadata_queue.get(timeout=1)]
+            except queue.Empty:
+                if unsynced:
+                    sync(self._metadata_out.fileno())
+                    unsynced = False
+                    last_sync = time.monotonic()
+                continue
+            
+            # Take whatever else is already waiting so a burst is one write
+            while len(entries) < 64:
+                try:
+                    entries.append(self._metadata_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            done = entries[-1] is None
+            if done:
+                entries.pop()
+            for entry in entries:
+                ns = entry.pop('downloaded_at_ns')
+                entry['downloaded_at'] = datetime.fromtimestamp(ns // 10**9).replace(
+                    microsecond=ns // 1000 % 10**6).isoformat()
+            if entries:
+                self._metadata_out.write(b''.join(orjson.dumps(entry) + b'\n' for entry in entries))
+                self._metadata_out.flush()
+                unsynced = True
+            
+            # A steady stream never goes quiet, so also sync once a second
+            if unsynced and not done and time.monotonic() - last_sync >= 1:
+                sync(self._metadata_out.fileno())
+                unsynced = False
+                last_sync = time.monotonic()
+            
+            if done:
+                if unsynced:
+                    sync(self._metadata_out.fileno())
+                self._metadata_out.close()
+                return
+    
+    def close_metadata(self):
+        """Write out any queued metadata entries and close the file"""
+        if self._metadata_writer.is_alive():
+            self._metadata_queue.put(None)
+            self._metadata_writer.join()
+        
+        if self._metadata_error is not None:
+            print(f"Error writing {self.metadata_file}: {self._metadata_error}")
+            raise self._metadata_error
+    
     def get_photo_urls_from_recent_page(self, page=1):
         """Get photo URLs from recent photos page"""
         print(f"Fetching recent photos page {page}...")
@@ -58,10 +250,13 @@ class GeographScraper:
             url += f"?page={page}"
         
         try:
-            response = self.session.get(url, timeout=10)
+            response = self._limiter.get(url, timeout=10)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # Hand lxml the raw bytes with the charset from the headers, so
+            # the page is decoded once and never run through charset detection
+            soup = BeautifulSoup(response.content, 'lxml', from_encoding=response.encoding,
+                                 parse_only=_RECENT_STRAINER)
             photos = []
             
             # Find the main thumbs container
@@ -84,7 +279,7 @@ class GeographScraper:
                 photo_data['page_url'] = photo_url
                 
                 # Extract photo ID from URL
-                match = re.search(r'/photo/(\d+)', link['href'])
+                match = _PHOTO_ID_RE.search(link['href'])
                 if match:
                     photo_data['photo_id'] = match.group(1)
                 
@@ -94,23 +289,18 @@ class GeographScraper:
                     # Get thumbnail URL
                     if 'src' in img.attrs:
                         photo_data['thumbnail_url'] = img['src']
+                        # Full size is the thumbnail without its _120x120
+                        # suffix, so most photos never need a server probe
+                        photo_data['image_url'] = img['src'].replace('_120x120.jpg', '.jpg')
                     
                     # Extract title and grid reference from alt text
                     # Format is usually: "GRIDREF : Title by Photographer"
                     alt_text = img.get('alt', '')
                     if alt_text:
                         # Parse the alt text
-                        if ' : ' in alt_text:
-                            parts = alt_text.split(' : ', 1)
-                            photo_data['gridref'] = parts[0]
-                            
-                            # Parse title and photographer
-                            if ' by ' in parts[1]:
-                                title_parts = parts[1].rsplit(' by ', 1)
-                                photo_data['title'] = title_parts[0]
-                                photo_data['photographer'] = title_parts[1] if len(title_parts) > 1 else ''
-                            else:
-                                photo_data['title'] = parts[1]
+                        alt_match = _ALT_RE.fullmatch(alt_text)
+                        if alt_match:
+                            photo_data.update((k, v) for k, v in alt_match.groupdict().items() if v is not None)
                         else:
                             photo_data['title'] = alt_text
                 
@@ -130,6 +320,9 @@ class GeographScraper:
         # Thumbnail: https://s0.geograph.org.uk/geophotos/08/12/45/8124576_76a4d3ca_120x120.jpg
         # Full size: https://s0.geograph.org.uk/geophotos/08/12/45/8124576_76a4d3ca.jpg
         
+        if photo_data.get('image_url'):
+            return photo_data['image_url']
+        
         thumbnail_url = photo_data.get('thumbnail_url')
         if thumbnail_url:
             # Simply remove the _120x120 suffix
@@ -140,6 +333,13 @@ class GeographScraper:
         photo_id = photo_data.get('photo_id')
         if not photo_id:
             return None
+        return self.probe_image_url(photo_id)
+    
+    def probe_image_url(self, photo_id):
+        """Find a photo's full-size image URL by probing the image servers"""
+        cached = self.url_cache.get(photo_id)
+        if cached:
+            return cached
             
         # Try to construct a URL based on common patterns
         # This is less reliable than using the thumbnail URL
@@ -158,48 +358,72 @@ class GeographScraper:
             dir3 = padded[4:6]
         
         # Try common server numbers
-        for server_num in range(4):
-            url = f"https://s{server_num}.geograph.org.uk/geophotos/{dir1}/{dir2}/{dir3}/{photo_id}.jpg"
+        urls = [f"https://s{server_num}.geograph.org.uk/geophotos/{dir1}/{dir2}/{dir3}/{photo_id}.jpg"
+                for server_num in range(4)]
+        bucket = (dir1, dir2, dir3)
+        
+        server_num = self._bucket_servers.get(bucket)
+        if server_num is None or not self._probe_image_url(urls[server_num]):
+            # Probe all servers at once so a slow one doesn't hold up the
+            # rest; the first to answer wins
+            probes = concurrent.futures.ThreadPoolExecutor(max_workers=len(urls))
+            futures = {probes.submit(self._probe_image_url, url): n for n, url in enumerate(urls)}
             try:
-                response = self.session.head(url, timeout=5)
-                if response.status_code == 200:
-                    return url
-            except:
-                continue
+                server_num = None
+                for future in concurrent.futures.as_completed(futures):
+                    if future.result():
+                        server_num = futures[future]
+                        break
+            finally:
+                # Don't wait for the stragglers' timeouts
+                for future in futures:
+                    future.cancel()
+                probes.shutdown(wait=False)
+            
+            if server_num is None:
+                return None
         
-        return None
+        url = urls[server_num]
+        with self._lock:
+            self._bucket_servers[bucket] = server_num
+            self.url_cache[photo_id] = url
+        return url
+    
+    def _probe_image_url(self, url):
+        """Check with a HEAD request whether an image exists at url"""
+        try:
+            self._limiter.wait()
+            return self.session.head(url, timeout=5).status_code == 200
+        except:
+            return False
     
     def get_gps_from_exif(self, img_data):
         """Extract GPS coordinates from EXIF data"""
         try:
-            img = Image.open(io.BytesIO(img_data))
-            exifdata = img.getexif()
-            
-            if not exifdata:
-                return None
+            # Read the tags straight out of the JPEG bytes, leaving Pillow
+            # for anything that walk can't handle
+            gps_data = read_jpeg_gps(img_data)
+            if gps_data is None:
+                # Opening only parses the headers; the pixels are never decoded
+                img = Image.open(io.BytesIO(img_data))
+                
+                # Go straight to the GPS IFD instead of walking every EXIF tag.
+                # getexif() itself only holds the IFD's offset under GPSInfo.
+                gps_data = img.getexif().get_ifd(IFD.GPSInfo)
             
-            # Look for GPS IFD
-            for tag_id, value in exifdata.items():
-                tag = TAGS.get(tag_id, tag_id)
-                if tag == "GPSInfo":
-                    gps_data = {}
-                    for gps_tag_id in value:
-                        gps_tag = GPSTAGS.get(gps_tag_id, gps_tag_id)
-                        gps_data[gps_tag] = value[gps_tag_id]
+            # Extract lat/lon if available
+            if GPS.GPSLatitude in gps_data and GPS.GPSLongitude in gps_data:
+                lat = self.convert_to_degrees(gps_data[GPS.GPSLatitude])
+                lon = self.convert_to_degrees(gps_data[GPS.GPSLongitude])
+                
+                # Handle N/S and E/W
+                if gps_data.get(GPS.GPSLatitudeRef) == "S":
+                    lat = -lat
+                if gps_data.get(GPS.GPSLongitudeRef) == "W":
+                    lon = -lon
                     
-                    # Extract lat/lon if available
-                    if "GPSLatitude" in gps_data and "GPSLongitude" in gps_data:
-                        lat = self.convert_to_degrees(gps_data["GPSLatitude"])
-                        lon = self.convert_to_degrees(gps_data["GPSLongitude"])
-                        
-                        # Handle N/S and E/W
-                        if gps_data.get("GPSLatitudeRef") == "S":
-                            lat = -lat
-                        if gps_data.get("GPSLongitudeRef") == "W":
-                            lon = -lon
-                            
-                        return {"latitude": lat, "longitude": lon}
-                        
+                return {"latitude": lat, "longitude": lon}
+                
         except Exception as e:
             print(f"Error reading EXIF: {e}")
             
@@ -208,7 +432,9 @@ class GeographScraper:
     def convert_to_degrees(self, value):
         """Convert GPS coordinates to degrees"""
         try:
-            d, m, s = value
+            # Plain floats up front, so the arithmetic below doesn't go
+            # through IFDRational's Python-level operators
+            d, m, s = map(float, value)
             return d + (m / 60.0) + (s / 3600.0)
         except:
             return 0
@@ -218,6 +444,17 @@ class GeographScraper:
         photo_id = photo_data.get('photo_id')
         if not photo_id:
             return False
+        
+        # Already downloaded by an earlier run, which recorded its metadata
+        previous = self._previous.get(photo_id)
+        if previous:
+            filename, has_gps = previous
+            if os.path.exists(os.path.join(self.gps_dir if has_gps else self.no_gps_dir, filename)):
+                print(f"Already downloaded: {filename}")
+                with self._lock:
+                    self.stats['with_gps' if has_gps else 'without_gps'] += 1
+                    self.stats['total_downloaded'] += 1
+                return True
             
         # Get image URL
         img_url = self.get_image_url_from_thumbnail(photo_data)
@@ -229,36 +466,56 @@ class GeographScraper:
             print(f"Downloading photo {photo_id}: {photo_data.get('title', 'Untitled')}")
             print(f"  URL: {img_url}")
             
-            response = self.session.get(img_url, timeout=15)
-            response.raise_for_status()
-            
-            img_data = response.content
-            
-            # Check EXIF for GPS
-            gps_coords = self.get_gps_from_exif(img_data)
-            
-            # Determine filename and directory
-            filename = f"geograph_{photo_id}.jpg"
+            response = self._limiter.get(img_url, timeout=15, stream=True)
+            if response.status_code == 404 and img_url == photo_data.get('image_url'):
+                # The thumbnail's name didn't carry over to the full-size
+                # image; look for it on the servers instead
+                response.close()
+                img_url = self.probe_image_url(photo_id)
+                if not img_url:
+                    print(f"Could not find image URL for photo {photo_id}")
+                    return False
+                print(f"  URL: {img_url}")
+                response = self._limiter.get(img_url, timeout=15, stream=True)
             
-            if gps_coords:
-                filepath = os.path.join(self.gps_dir, filename)
-                has_gps = True
-                self.stats['with_gps'] += 1
-                print(f"  ✓ GPS in EXIF: {gps_coords['latitude']:.6f}, {gps_coords['longitude']:.6f}")
-            else:
-                filepath = os.path.join(self.no_gps_dir, filename)
-                has_gps = False
-                self.stats['without_gps'] += 1
-                print(f"  ✗ No GPS in EXIF")
-                if photo_data.get('gridref'):
-                    print(f"  (Grid reference: {photo_data['gridref']})")
-            
-            # Save image
-            with open(filepath, 'wb') as f:
-                f.write(img_data)
+            with response:
+                response.raise_for_status()
+                
+                # Read just the head of the image to check EXIF for GPS; the
+                # rest is streamed straight to disk once the folder is known
+                chunks = response.iter_content(chunk_size=_EXIF_PROBE_BYTES)
+                head = b''
+                for chunk in chunks:
+                    head += chunk
+                    if len(head) >= _EXIF_PROBE_BYTES:
+                        break
+                
+                gps_coords = self.get_gps_from_exif(head)
+                
+                # Determine filename and directory
+                filename = f"geograph_{photo_id}.jpg"
+                
+                if gps_coords:
+                    filepath = os.path.join(self.gps_dir, filename)
+                    has_gps = True
+                    print(f"  ✓ GPS in EXIF: {gps_coords['latitude']:.6f}, {gps_coords['longitude']:.6f}")
+                else:
+                    filepath = os.path.join(self.no_gps_dir, filename)
+                    has_gps = False
+                    print(f"  ✗ No GPS in EXIF")
+                    if photo_data.get('gridref'):
+                        print(f"  (Grid reference: {photo_data['gridref']})")
+                
+                # Save image via a .part file, renamed when complete
+                temp_path = filepath + '.part'
+                with open(temp_path, 'wb') as f:
+                    f.write(head)
+                    for chunk in chunks:
+                        f.write(chunk)
+                os.replace(temp_path, filepath)
             
-            # Save metadata
-            self.metadata.append({
+            # Save metadata; the writer thread appends it to the file
+            entry = {
                 "photo_id": photo_id,
                 "filename": filename,
                 "title": photo_data.get('title', ''),
@@ -268,55 +525,81 @@ class GeographScraper:
                 "page_url": photo_data.get('page_url', ''),
                 "has_gps_exif": has_gps,
                 "exif_coords": gps_coords,
-                "downloaded_at": datetime.now().isoformat()
-            })
-            
-            self.stats['total_downloaded'] += 1
+                # Formatted as downloaded_at by the writer thread
+                "downloaded_at_ns": time.time_ns()
+            }
+            self._metadata_queue.put(entry)
+            with self._lock:
+                self._previous[photo_id] = (filename, has_gps)
+                
+                self.stats['with_gps' if has_gps else 'without_gps'] += 1
+                self.stats['total_downloaded'] += 1
             return True
             
         except Exception as e:
             print(f"Error downloading {photo_id}: {e}")
-            self.stats['failed'] += 1
+            with self._lock:
+                self.stats['failed'] += 1
             return False
     
+    def save_caches(self):
+        """Write the URL cache"""
+        with self._lock:
+            self.url_cache.save()
+    
     def scrape(self):
         """Main scraping function"""
         print(f"Starting Geograph.org.uk scraper...")
         print(f"Output directory: {self.output_dir}")
         print(f"Maximum photos: {self.max_photos}")
+        print(f"Concurrent workers: {self.max_workers}")
         print("-" * 50)
         
         photos_downloaded = 0
         page = 1
+        last_report = 0.0
         
-        while photos_downloaded < self.max_photos:
-            photos = self.get_photo_urls_from_recent_page(page)
-            
-            if not photos:
-                print("No more photos found")
-                break
-            
-            for photo_data in photos:
-                if photos_downloaded >= self.max_photos:
-                    break
-                
-                if self.download_and_classify_photo(photo_data):
-                    photos_downloaded += 1
-                    # Print running tally
-                    print(f"Progress: {photos_downloaded}/{self.max_photos} | GPS: {self.stats['with_gps']} | No GPS: {self.stats['without_gps']} | Failed: {self.stats['failed']}")
-                    print("-" * 70)
+        # Download photos concurrently
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                while photos_downloaded < self.max_photos:
+                    photos = self.get_photo_urls_from_recent_page(page)
                     
-                # Be polite - wait between downloads
-                time.sleep(2)
-                
-            page += 1  # Move to next page
-            
-            # Longer delay between pages
-            time.sleep(3)
+                    if not photos:
+                        print("No more photos found")
+                        break
+                    
+                    # Only queue as many photos as are still needed
+                    remaining = self.max_photos - photos_downloaded
+                    futures = [pool.submit(self.download_and_classify_photo, photo_data)
+                               for photo_data in photos[:remaining]]
+                    
+                    try:
+                        for future in concurrent.futures.as_completed(futures):
+                            if future.result():
+                                photos_downloaded += 1
+                                
+                                # Print running tally, at most once a second
+                                # so it doesn't drown out the per-photo lines
+                                now = time.monotonic()
+                                if now - last_report < 1 and photos_downloaded < self.max_photos:
+                                    continue
+                                last_report = now
+                                print(f"Progress: {photos_downloaded}/{self.max_photos} | GPS: {self.stats['with_gps']} | No GPS: {self.stats['without_gps']} | Failed: {self.stats['failed']}")
+                                print("-" * 70)
+                    except KeyboardInterrupt:
+                        # Drop queued photos
+                        for future in futures:
+                            future.cancel()
+                        self.save_caches()
+                        raise
+                        
+                    page += 1  # Move to next page
+        finally:
+            # Only after the pool has let in-flight photos finish
+            self.close_metadata()
         
-        # Save metadata
-        with open(self.metadata_file, 'w') as f:
-            json.dump(self.metadata, f, indent=2)
+        self.save_caches()
         
         # Print summary
         print("\n" + "=" * 70)
@@ -353,10 +636,13 @@ def main():
                        help='Output directory (default: scraped_photos)')
     parser.add_argument('-n', '--number', type=int, default=50,
                        help='Maximum number of photos to download (default: 50)')
+    parser.add_argument('-w', '--workers', type=int, default=4,
+                       help='Number of photos to download concurrently (default: 4)')
     
     args = parser.parse_args()
     
-    scraper = GeographScraper(output_dir=args.output, max_photos=args.number)
+    scraper = GeographScraper(output_dir=args.output, max_photos=args.number,
+                              max_workers=args.workers)
     scraper.scrape()
 
 if __name__ == "__main__":
@@ -0,0 +1,151 @@
+"""
+Shared helpers for the photo scrapers
+Imported by the scraper scripts in this directory
+"""
+
+import hashlib
+import json
+import os
+import re
+import string
+import threading
+import time
+from datetime import datetime
+
+class RateLimiter:
+    """Spaces a session's requests across worker threads and backs off when the server pushes back"""
+
+    def __init__(self, session, min_interval=0.2, max_retries=3, busy_statuses=(429,)):
+        self.session = session
+        self.min_interval = min_interval
+        self.max_retries = max_retries
+        self.busy_statuses = busy_statuses
+        self._next_request_at = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until the next request may start, at least min_interval after the last one"""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_request_at - now
+            self._next_request_at = max(now, self._next_request_at) + self.min_interval
+
+        if wait > 0:
+            time.sleep(wait)
+
+    def get(self, url, **kwargs):
+        """GET a URL in turn, retrying with backoff while the server answers busy"""
+        for attempt in range(self.max_retries + 1):
+            self.wait()
+            response = self.session.get(url, **kwargs)
+
+            if response.status_code not in self.busy_statuses or attempt == self.max_retries:
+                return response
+
+            # Honor Retry-After when given, never waiting less than the backoff
+            delay = 2 ** attempt
+            retry_after = response.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                delay = max(delay, int(retry_after))
+            delay = min(delay, 30)
+
+            response.close()
+            print(f"  Server busy ({response.status_code}), retrying in {delay}s...")
+            # Push back the shared schedule so every worker slows down; the
+            # next wait() does the waiting
+            with self._lock:
+                self._next_request_at = max(self._next_request_at, time.monotonic() + delay)
+
+
+class JsonCache(dict):
+    """A dict loaded from a JSON file when one exists, written back by save()"""
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    self.update(json.load(f))
+            except:
+                pass  # Unreadable cache; start empty
+
+    def save(self):
+        """Write the cache, replacing the old file atomically"""
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(self, f)
+        os.replace(temp_path, self.path)
+
+
+class ContentHashes(JsonCache):
+    """BLAKE2b digest of every saved image -> its filename in photos_dir"""
+
+    def __init__(self, path, photos_dir, lock):
+        super().__init__(path)
+        self.photos_dir = photos_dir
+        # The owning scraper's lock, which also guards save()
+        self._lock = lock
+
+    def link_duplicate(self, filepath, digest):
+        """Replace a just-saved image with a hard link if its bytes are already on disk"""
+        filename = os.path.basename(filepath)
+        with self._lock:
+            original = self.get(digest)
+            original_path = original and os.path.join(self.photos_dir, original)
+            if not original_path or original == filename or not os.path.exists(original_path):
+                self[digest] = filename
+                return
+
+        # Link under a temporary name first so filepath is never missing
+        link_path = filepath + '.link'
+        try:
+            os.link(original_path, link_path)
+            os.replace(link_path, filepath)
+            print(f"  Identical to {original}, hard-linked")
+        except OSError:
+            pass  # Filesystem without hard links; keep the copy
+
+
+def save_stream(chunks, filepath):
+    """Write chunks to filepath and return their BLAKE2b digest
+
+    The data goes to a .part file that is renamed into place at the end, so
+    an interrupted download is never mistaken for a finished one.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    temp_path = filepath + '.part'
+    with open(temp_path, 'wb') as f:
+        for chunk in chunks:
+            f.write(chunk)
+            digest.update(chunk)
+    os.replace(temp_path, filepath)
+    return digest.hexdigest()
+
+
+# Last whole second formatted by timestamp(), as (epoch seconds, ISO string);
+# replaced as one tuple so worker threads never see a torn pair
+_last_timestamp = (None, '')
+
+def timestamp():
+    """Local time as an ISO string, formatted at most once per second"""
+    global _last_timestamp
+    now = int(time.time())
+    second, formatted = _last_timestamp
+    if second != now:
+        formatted = datetime.fromtimestamp(now).isoformat()
+        _last_timestamp = (now, formatted)
+    return formatted
+
+
+_CLEAN_NAME_RE = re.compile(r'[^a-zA-Z0-9_-]')
+# Lookup table for clean_name(): every ASCII character other than letters,
+# digits, '_' and '-' maps to '_'
+_SAFE_NAME_CHARS = frozenset(string.ascii_letters + string.digits + '_-')
+_SANITIZE_TABLE = str.maketrans({chr(i): '_' for i in range(128) if chr(i) not in _SAFE_NAME_CHARS})
+
+def clean_name(name):
+    """Replace characters that are not safe in filenames with underscores"""
+    if name.isascii():
+        return name.translate(_SANITIZE_TABLE)
+    return _CLEAN_NAME_RE.sub('_', name)